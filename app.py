@@ -1,8 +1,10 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-import groq
+import plotly.graph_objects as go
+from dataclasses import dataclass, asdict
 from datetime import datetime
+from types import MappingProxyType
 import io
 
 # --- PAGE CONFIG ---
@@ -14,57 +16,92 @@ st.set_page_config(
 )
 
 # --- INDUSTRY TEMPLATES ---
+@dataclass(frozen=True, slots=True)
+class IndustryTemplate:
+    hire_salary: int
+    current_salary: int
+    vacancy_months: int
+    social_percent: int
+    benefits_percent: int
+    prod_loss_percent: int
+    consultant_percent: int
+    interview_hours: int
+    interview_rate: int
+    training_cost: int
+
 INDUSTRY_TEMPLATES = {
-    "Tech": {
-        "hire_salary": 85000,
-        "vacancy_months": 4,
-        "social_percent": 22,
-        "benefits_percent": 12,
-        "prod_loss_percent": 50,
-        "consultant_percent": 30,
-        "interview_hours": 15,
-        "interview_rate": 80,
-        "training_cost": 2000,
-        "current_salary": 75000
-    },
-    "Healthcare": {
-        "hire_salary": 65000,
-        "vacancy_months": 3,
-        "social_percent": 24,
-        "benefits_percent": 15,
-        "prod_loss_percent": 40,
-        "consultant_percent": 20,
-        "interview_hours": 10,
-        "interview_rate": 70,
-        "training_cost": 1500,
-        "current_salary": 55000
-    },
-    "Retail": {
-        "hire_salary": 35000,
-        "vacancy_months": 2,
-        "social_percent": 20,
-        "benefits_percent": 8,
-        "prod_loss_percent": 30,
-        "consultant_percent": 15,
-        "interview_hours": 8,
-        "interview_rate": 50,
-        "training_cost": 500,
-        "current_salary": 30000
-    },
-    "Finance": {
-        "hire_salary": 75000,
-        "vacancy_months": 5,
-        "social_percent": 23,
-        "benefits_percent": 18,
-        "prod_loss_percent": 45,
-        "consultant_percent": 25,
-        "interview_hours": 12,
-        "interview_rate": 90,
-        "training_cost": 2500,
-        "current_salary": 65000
-    }
+    "Tech": IndustryTemplate(
+        hire_salary=85000,
+        current_salary=75000,
+        vacancy_months=4,
+        social_percent=22,
+        benefits_percent=12,
+        prod_loss_percent=50,
+        consultant_percent=30,
+        interview_hours=15,
+        interview_rate=80,
+        training_cost=2000,
+    ),
+    "Healthcare": IndustryTemplate(
+        hire_salary=65000,
+        current_salary=55000,
+        vacancy_months=3,
+        social_percent=24,
+        benefits_percent=15,
+        prod_loss_percent=40,
+        consultant_percent=20,
+        interview_hours=10,
+        interview_rate=70,
+        training_cost=1500,
+    ),
+    "Retail": IndustryTemplate(
+        hire_salary=35000,
+        current_salary=30000,
+        vacancy_months=2,
+        social_percent=20,
+        benefits_percent=8,
+        prod_loss_percent=30,
+        consultant_percent=15,
+        interview_hours=8,
+        interview_rate=50,
+        training_cost=500,
+    ),
+    "Finance": IndustryTemplate(
+        hire_salary=75000,
+        current_salary=65000,
+        vacancy_months=5,
+        social_percent=23,
+        benefits_percent=18,
+        prod_loss_percent=45,
+        consultant_percent=25,
+        interview_hours=12,
+        interview_rate=90,
+        training_cost=2500,
+    ),
 }
 
+# Session-state values per template, flattened once at import so loading is a single update
+TEMPLATE_SESSION_VALUES = {
+    name: {**asdict(template), "industry": name}
+    for name, template in INDUSTRY_TEMPLATES.items()
+}
+
+# --- COST CATEGORIES (pie chart order, matching "group_sums" in compute_costs results) ---
+COST_CATEGORIES = ("Recruiting", "Vacancy", "Onboarding", "Productivity", "Other", "Salary Difference")
+
+# --- RECOMMENDATION MESSAGES ---
+# Indexed by whether the new hire is the cheaper option
+RECOMMENDATIONS = (
+    (
+        (st.success, "🎯 Recommendation: Salary increase is cheaper"),
+        (st.info, "💰 You save ${difference:,.0f} ({percentage:.1f}%) with a salary increase"),
+    ),
+    (
+        (st.info, "🎯 Recommendation: New hire is cheaper"),
+        (st.success, "💰 You save ${difference:,.0f} ({percentage:.1f}%) with a new hire"),
+    ),
+)
+
 # --- AI AGENT TEMPLATES ---
 AI_AGENT_TEMPLATES = {
     "HR Chatbot": {
@@ -114,61 +151,124 @@ AI_AGENT_TEMPLATES = {
     }
 }
 
+# --- DETAILED INPUT REGISTRY ---
+# Each group is (expander title, left column, right column); each input is (label, session key, max_value)
+NEW_HIRE_INPUTS = (
+    ("🧲 Recruiting Costs", (
+        ("Job Ads (Quantity)", "job_ads_qty", None),
+        ("Job Ads ($ per ad)", "job_ads_price", None),
+        ("Recruitment Consultant (%)", "consultant_percent", 50),
+    ), (
+        ("Interview Hours", "interview_hours", None),
+        ("Interview Hourly Rate ($)", "interview_rate", None),
+        ("Assessment Center ($)", "assessment_price", None),
+    )),
+    ("⏳ Vacancy Costs", (
+        ("Lost Productivity ($/Month)", "productivity_price", None),
+        ("Overtime Hours", "overtime_qty", None),
+        ("Overtime Rate ($/Hour)", "overtime_price", None),
+    ), (
+        ("External Support (Days)", "external_qty", None),
+        ("External Support ($/Day)", "external_price", None),
+        ("Monthly Salary ($)", "salary_price", None),
+    )),
+    ("🎓 Onboarding Costs", (
+        ("HR Effort (Hours)", "hr_hours", None),
+        ("HR Hourly Rate ($)", "hr_rate", None),
+        ("Colleague Training (Hours)", "colleague_hours", None),
+        ("Colleague Hourly Rate ($)", "colleague_rate", None),
+    ), (
+        ("Training/Courses ($)", "training_cost", None),
+        ("IT Setup & Equipment ($)", "it_cost", None),
+        ("Mentor Hours", "mentor_hours", None),
+        ("Mentor Hourly Rate ($)", "mentor_rate", None),
+    )),
+    ("⚠️ Other Costs", (
+        ("Error Rate ($)", "error_cost", None),
+        ("Knowledge Loss ($)", "knowhow_cost", None),
+    ), (
+        ("Customer Retention/Revenue Loss ($)", "customer_cost", None),
+        ("Team Morale ($)", "team_cost", None),
+    )),
+)
+
+SALARY_INCREASE_INPUTS = (
+    ("💶 Salary Increase Details", (
+        ("Increase (%)", "increase_percent", 50),
+    ), (
+        ("Social Security on Increase (%)", "social_increase_percent", None),
+        ("Benefits on Increase (%)", "benefits_increase_percent", None),
+    )),
+)
+
+# --- DEFAULTS ---
+DEFAULTS = MappingProxyType({
+    "hire_salary": 60000,
+    "vacancy_months": 3,
+    "social_percent": 22,
+    "benefits_percent": 8,
+    "prod_loss_percent": 40,
+    "industry": "General",
+    "job_ads_qty": 2,
+    "job_ads_price": 800,
+    "consultant_percent": 25,
+    "interview_hours": 12,
+    "interview_rate": 70,
+    "assessment_qty": 1,
+    "assessment_price": 1500,
+    "travel_qty": 2,
+    "travel_price": 300,
+    "background_qty": 1,
+    "background_price": 200,
+    "productivity_price": 6000,
+    "overtime_qty": 30,
+    "overtime_price": 50,
+    "external_qty": 20,
+    "external_price": 400,
+    "salary_price": 6000,
+    "hr_hours": 10,
+    "hr_rate": 50,
+    "colleague_hours": 15,
+    "colleague_rate": 60,
+    "training_cost": 1000,
+    "it_cost": 1200,
+    "mentor_hours": 6,
+    "mentor_rate": 60,
+    "error_cost": 1400,
+    "knowhow_cost": 2000,
+    "customer_cost": 2500,
+    "team_cost": 2000,
+    "current_salary": 60000,
+    "increase_percent": 8,
+    "social_increase_percent": 22,
+    "benefits_increase_percent": 8,
+    # AI Agent defaults
+    "ai_agent_type": "HR Chatbot",
+    "ai_setup_cost": 15000,
+    "ai_monthly_cost": 2000,
+    "ai_time_saved": 20,
+    "ai_hourly_rate": 50,
+    "ai_accuracy_improvement": 15,
+    "ai_candidate_experience": 8.5,
+    "ai_implementation_months": 2,
+    "ai_roi_years": 3,
+})
+
 # --- SESSION STATE INIT ---
+# Only writes keys whose value differs and reports whether anything changed,
+# so callers can skip a rerun when e.g. Reset is clicked twice
+def apply_session_values(values):
+    changed = {key: value for key, value in values.items() if st.session_state.get(key) != value}
+    st.session_state.update(changed)
+    return bool(changed)
+
 def reset_to_defaults():
-    defaults = {
-        "hire_salary": 60000,
-        "vacancy_months": 3,
-        "social_percent": 22,
-        "benefits_percent": 8,
-        "prod_loss_percent": 40,
-        "industry": "General",
-        "job_ads_qty": 2,
-        "job_ads_price": 800,
-        "consultant_percent": 25,
-        "interview_hours": 12,
-        "interview_rate": 70,
-        "assessment_qty": 1,
-        "assessment_price": 1500,
-        "travel_qty": 2,
-        "travel_price": 300,
-        "background_qty": 1,
-        "background_price": 200,
-        "productivity_price": 6000,
-        "overtime_qty": 30,
-        "overtime_price": 50,
-        "external_qty": 20,
-        "external_price": 400,
-        "salary_price": 6000,
-        "hr_hours": 10,
-        "hr_rate": 50,
-        "colleague_hours": 15,
-        "colleague_rate": 60,
-        "training_cost": 1000,
-        "it_cost": 1200,
-        "mentor_hours": 6,
-        "mentor_rate": 60,
-        "error_cost": 1400,
-        "knowhow_cost": 2000,
-        "customer_cost": 2500,
-        "team_cost": 2000,
-        "current_salary": 60000,
-        "increase_percent": 8,
-        "social_increase_percent": 22,
-        "benefits_increase_percent": 8,
-        # AI Agent defaults
-        "ai_agent_type": "HR Chatbot",
-        "ai_setup_cost": 15000,
-        "ai_monthly_cost": 2000,
-        "ai_time_saved": 20,
-        "ai_hourly_rate": 50,
-        "ai_accuracy_improvement": 15,
-        "ai_candidate_experience": 8.5,
-        "ai_implementation_months": 2,
-        "ai_roi_years": 3,
-    }
-    for key, value in defaults.items():
-        st.session_state[key] = value
+    return apply_session_values(DEFAULTS)
+
+# Plain-dict snapshot of the given session keys, falling back to DEFAULTS
+def session_inputs(keys):
+    state = st.session_state
+    return {key: state.get(key, DEFAULTS[key]) for key in keys}
 
 def initialize_session_state():
     if 'initialized' not in st.session_state:
@@ -176,10 +276,7 @@ def initialize_session_state():
         st.session_state.initialized = True
 
 def load_template(template_name):
-    template = INDUSTRY_TEMPLATES[template_name]
-    for key, value in template.items():
-        st.session_state[key] = value
-    st.session_state['industry'] = template_name
+    return apply_session_values(TEMPLATE_SESSION_VALUES[template_name])
 
 def load_ai_template(template_name):
     template = AI_AGENT_TEMPLATES[template_name]
@@ -192,58 +289,166 @@ def load_ai_template(template_name):
         "candidate_experience_score": "ai_candidate_experience",
         "implementation_months": "ai_implementation_months"
     }
-    for template_key, session_key in mapping.items():
-        st.session_state[session_key] = template[template_key]
-    st.session_state['ai_agent_type'] = template_name
+    values = {session_key: template[template_key] for template_key, session_key in mapping.items()}
+    values['ai_agent_type'] = template_name
+    return apply_session_values(values)
+
+# --- INPUT RENDERING ---
+def render_input_group(title, left, right, expanded=False):
+    with st.expander(title, expanded=expanded):
+        for column, inputs in zip(st.columns(2), (left, right)):
+            with column:
+                for label, key, max_value in inputs:
+                    st.number_input(label, min_value=0, max_value=max_value, key=key)
+
+# --- CHARTS ---
+# Read-only charts skip Plotly.js interaction handlers and the mode bar
+STATIC_CHART_CONFIG = {"staticPlot": True, "displayModeBar": False}
+
+# Figures are memoized on their (hashable) inputs so unrelated reruns skip Plotly construction;
+# cache_resource hands back the cached figure itself instead of unpickling a copy on every hit
+@st.cache_resource(max_entries=32, show_spinner=False)
+def build_cost_pie(values):
+    fig = go.Figure(go.Pie(
+        values=values,
+        labels=COST_CATEGORIES,
+        marker=dict(colors=px.colors.qualitative.Set3),
+        textposition='inside',
+        textinfo='percent+label'
+    ))
+    fig.update_layout(title="New Hire - Cost Distribution", height=400, uirevision="fixed")
+    return fig
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def build_ai_roi_chart(setup_cost, monthly_cost, monthly_savings):
+    # Monthly comparison chart
+    months = list(range(1, 37))  # 3 years
+    cumulative_costs = [setup_cost + (monthly_cost * month) for month in months]
+    cumulative_savings = [monthly_savings * month for month in months]
+    cumulative_net = [savings - cost for savings, cost in zip(cumulative_savings, cumulative_costs)]
+
+    fig = go.Figure([
+        go.Scatter(x=months, y=series, mode='lines', name=name)
+        for name, series in (
+            ('Cumulative Costs', cumulative_costs),
+            ('Cumulative Savings', cumulative_savings),
+            ('Net Benefit', cumulative_net)
+        )
+    ])
+    fig.update_layout(
+        title="AI Implementation: Costs vs Savings Over Time",
+        xaxis_title="Month",
+        yaxis_title="Amount ($)",
+        legend_title_text="Category",
+        uirevision="fixed"
+    )
+    fig.add_hline(y=0, line_dash="dash", line_color="red", annotation_text="Break-even")
+    return fig
+
+STRATEGY_OPTIONS = ('New Hire', 'Salary Increase', 'AI Agent (3yr benefit)')
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def build_strategy_scatter(cost_benefit, implementation_time):
+    df = pd.DataFrame({
+        'Option': STRATEGY_OPTIONS,
+        'Cost/Benefit': cost_benefit,
+        'Implementation Time': implementation_time
+    })
+    fig = px.scatter(df, x='Implementation Time', y='Cost/Benefit', 
+                    text='Option', size=[abs(x) for x in cost_benefit], 
+                    color='Cost/Benefit',
+                    title="Strategic Options Comparison",
+                    labels={
+                        'Implementation Time': 'Time to Implement (Months)',
+                        'Cost/Benefit': 'Net Financial Impact ($)'
+                    },
+                    color_continuous_scale="RdYlGn")
+    fig.add_hline(y=0, line_dash="dash", line_color="gray", annotation_text="Break-even Line")
+    fig.update_traces(textposition="top center")
+    fig.update_layout(height=500, uirevision="fixed")
+    return fig
 
 # --- AI INIT ---
+# Looked up once; a missing secrets.toml or key resolves to None instead of raising on every rerun
+@st.cache_data(show_spinner=False)
+def read_secret(name):
+    try:
+        return st.secrets[name]
+    except Exception:
+        return None
+
+def resolve_groq_api_key():
+    return read_secret("GROQ_API_KEY") or st.session_state.get("groq_api_key")
+
+# Models can be swapped per deployment through secrets.toml; scenarios are a shorter,
+# templated task and use the fast model
+AI_MODEL = read_secret("GROQ_MODEL") or "llama-3.1-8b-instant"
+AI_FAST_MODEL = read_secret("GROQ_FAST_MODEL") or "llama-3.1-8b-instant"
+
+# Cached per API key, so entering a key later creates a client instead of reusing a cached None
 @st.cache_resource
-def init_groq():
+def init_groq(api_key):
+    if not api_key:
+        return None
     try:
-        api_key = st.secrets.get("GROQ_API_KEY") or st.session_state.get("groq_api_key")
-        if not api_key:
-            return None
+        import groq  # deferred so sessions without a key never pay the import
         return groq.Groq(api_key=api_key)
     except Exception as e:
         st.error(f"AI Initialization Error: {e}")
         return None
 
 # --- COST CALCULATION (INCREMENTAL) ---
-def calculate_costs():
-    hire_salary = st.session_state.get('hire_salary', 60000)
-    current_salary = st.session_state.get('current_salary', 60000)
-    vacancy_months = st.session_state.get('vacancy_months', 3)
-    social_percent = st.session_state.get('social_percent', 22)
-    benefits_percent = st.session_state.get('benefits_percent', 8)
-    prod_loss_percent = st.session_state.get('prod_loss_percent', 40)
+# Session keys read by the new hire / salary increase calculation
+COST_INPUT_KEYS = (
+    "hire_salary", "current_salary", "vacancy_months", "social_percent",
+    "benefits_percent", "prod_loss_percent", "job_ads_qty", "job_ads_price",
+    "consultant_percent", "interview_hours", "interview_rate", "assessment_qty",
+    "assessment_price", "travel_qty", "travel_price", "background_qty",
+    "background_price", "productivity_price", "overtime_qty", "overtime_price",
+    "external_qty", "external_price", "salary_price", "hr_hours",
+    "hr_rate", "colleague_hours", "colleague_rate", "training_cost",
+    "it_cost", "mentor_hours", "mentor_rate", "error_cost",
+    "knowhow_cost", "customer_cost", "team_cost", "increase_percent",
+    "social_increase_percent", "benefits_increase_percent",
+)
+
+# Pure calculation over an inputs snapshot. Deliberately not st.cache_data: hashing the
+# inputs and unpickling the results costs far more than the few µs of arithmetic here
+def compute_costs(inputs):
+    hire_salary = inputs['hire_salary']
+    current_salary = inputs['current_salary']
+    vacancy_months = inputs['vacancy_months']
+    social_percent = inputs['social_percent']
+    benefits_percent = inputs['benefits_percent']
+    prod_loss_percent = inputs['prod_loss_percent']
 
     # Recruiting costs
     recruiting_costs = {
-        "Job Advertisements": st.session_state.get('job_ads_qty', 2) * st.session_state.get('job_ads_price', 800),
-        "Recruitment Consultant": hire_salary * (st.session_state.get('consultant_percent', 25) / 100),
-        "Interviews": st.session_state.get('interview_hours', 12) * st.session_state.get('interview_rate', 70),
-        "Assessment Center": st.session_state.get('assessment_qty', 1) * st.session_state.get('assessment_price', 1500),
-        "Travel Expenses": st.session_state.get('travel_qty', 2) * st.session_state.get('travel_price', 300),
-        "Background Checks": st.session_state.get('background_qty', 1) * st.session_state.get('background_price', 200),
+        "Job Advertisements": inputs['job_ads_qty'] * inputs['job_ads_price'],
+        "Recruitment Consultant": hire_salary * (inputs['consultant_percent'] / 100),
+        "Interviews": inputs['interview_hours'] * inputs['interview_rate'],
+        "Assessment Center": inputs['assessment_qty'] * inputs['assessment_price'],
+        "Travel Expenses": inputs['travel_qty'] * inputs['travel_price'],
+        "Background Checks": inputs['background_qty'] * inputs['background_price'],
     }
     recruiting_sum = sum(recruiting_costs.values())
 
     # Vacancy costs
     vacancy_costs = {
-        "Lost Productivity": vacancy_months * st.session_state.get('productivity_price', 6000),
-        "Team Overtime": st.session_state.get('overtime_qty', 30) * st.session_state.get('overtime_price', 50),
-        "External Support": st.session_state.get('external_qty', 20) * st.session_state.get('external_price', 400),
-        "Salary Savings": -(vacancy_months * st.session_state.get('salary_price', 6000)),
+        "Lost Productivity": vacancy_months * inputs['productivity_price'],
+        "Team Overtime": inputs['overtime_qty'] * inputs['overtime_price'],
+        "External Support": inputs['external_qty'] * inputs['external_price'],
+        "Salary Savings": -(vacancy_months * inputs['salary_price']),
     }
     vacancy_sum = sum(vacancy_costs.values())
 
     # Onboarding costs
     onboarding_costs = {
-        "HR Effort": st.session_state.get('hr_hours', 10) * st.session_state.get('hr_rate', 50),
-        "Colleague Training": st.session_state.get('colleague_hours', 15) * st.session_state.get('colleague_rate', 60),
-        "Training/Courses": st.session_state.get('training_cost', 1000),
-        "IT Setup & Equipment": st.session_state.get('it_cost', 1200),
-        "Mentor/Buddy System": st.session_state.get('mentor_hours', 6) * st.session_state.get('mentor_rate', 60),
+        "HR Effort": inputs['hr_hours'] * inputs['hr_rate'],
+        "Colleague Training": inputs['colleague_hours'] * inputs['colleague_rate'],
+        "Training/Courses": inputs['training_cost'],
+        "IT Setup & Equipment": inputs['it_cost'],
+        "Mentor/Buddy System": inputs['mentor_hours'] * inputs['mentor_rate'],
     }
     onboarding_sum = sum(onboarding_costs.values())
 
@@ -253,18 +458,17 @@ def calculate_costs():
 
     # Other costs
     other_costs = {
-        "Error Rate": st.session_state.get('error_cost', 1400),
-        "Knowledge Loss": st.session_state.get('knowhow_cost', 2000),
-        "Customer Retention/Revenue": st.session_state.get('customer_cost', 2500),
-        "Team Morale": st.session_state.get('team_cost', 2000),
+        "Error Rate": inputs['error_cost'],
+        "Knowledge Loss": inputs['knowhow_cost'],
+        "Customer Retention/Revenue": inputs['customer_cost'],
+        "Team Morale": inputs['team_cost'],
     }
     other_sum = sum(other_costs.values())
 
     # --- INCREMENTAL SALARY COSTS FOR NEW HIRE ---
+    # Social security and benefits both scale the salary difference, so apply them as one factor
     salary_difference = max(hire_salary - current_salary, 0)
-    social_difference = salary_difference * (social_percent / 100)
-    benefits_difference = salary_difference * (benefits_percent / 100)
-    annual_salary_difference = salary_difference + social_difference + benefits_difference
+    annual_salary_difference = salary_difference * (1 + (social_percent + benefits_percent) / 100)
 
     # Total incremental cost for new hire
     total_hire_incremental = (
@@ -273,9 +477,9 @@ def calculate_costs():
     )
 
     # Salary increase costs
-    increase_percent = st.session_state.get('increase_percent', 8)
-    social_increase_percent = st.session_state.get('social_increase_percent', 22)
-    benefits_increase_percent = st.session_state.get('benefits_increase_percent', 8)
+    increase_percent = inputs['increase_percent']
+    social_increase_percent = inputs['social_increase_percent']
+    benefits_increase_percent = inputs['benefits_increase_percent']
 
     increase_amount = current_salary * (increase_percent / 100)
     social_increase = increase_amount * (social_increase_percent / 100)
@@ -289,6 +493,8 @@ def calculate_costs():
         "productivity": {"sum": productivity_sum},
         "other": {"costs": other_costs, "sum": other_sum},
         "fixed": {"sum": annual_salary_difference},
+        # Group sums in COST_CATEGORIES order, shared by the pie chart and the AI prompts
+        "group_sums": (recruiting_sum, vacancy_sum, onboarding_sum, productivity_sum, other_sum, annual_salary_difference),
         "total_hire": total_hire_incremental,
         "total_salary_increase": total_salary_increase,
         "salary_breakdown": {
@@ -298,14 +504,26 @@ def calculate_costs():
         }
     }
 
+# Session keys passed to the AI prompts alongside the calculation results
+CONTEXT_KEYS = ("hire_salary", "vacancy_months", "prod_loss_percent", "industry")
+
+def calculate_costs():
+    return compute_costs(session_inputs(COST_INPUT_KEYS))
+
 # --- AI AGENT COST CALCULATION ---
+AI_COST_INPUT_KEYS = (
+    "ai_setup_cost", "ai_monthly_cost", "ai_time_saved", "ai_hourly_rate",
+    "ai_implementation_months", "ai_roi_years",
+)
+
 def calculate_ai_costs():
-    setup_cost = st.session_state.get('ai_setup_cost', 15000)
-    monthly_cost = st.session_state.get('ai_monthly_cost', 2000)
-    time_saved = st.session_state.get('ai_time_saved', 20)
-    hourly_rate = st.session_state.get('ai_hourly_rate', 50)
-    implementation_months = st.session_state.get('ai_implementation_months', 2)
-    roi_years = st.session_state.get('ai_roi_years', 3)
+    inputs = session_inputs(AI_COST_INPUT_KEYS)
+    setup_cost = inputs['ai_setup_cost']
+    monthly_cost = inputs['ai_monthly_cost']
+    time_saved = inputs['ai_time_saved']
+    hourly_rate = inputs['ai_hourly_rate']
+    implementation_months = inputs['ai_implementation_months']
+    roi_years = inputs['ai_roi_years']
     
     # Monthly savings from time saved
     monthly_savings = time_saved * hourly_rate * 4  # 4 weeks per month
@@ -342,67 +560,83 @@ def calculate_ai_costs():
         "implementation_months": implementation_months
     }
 
-# --- AI INSIGHTS ---
-def get_ai_insights(groq_client, calculation_data, context_data):
-    if not groq_client:
-        return None
+# --- AI RESPONSE CACHE ---
+# Identical requests return the stored answer instead of another Groq round-trip.
+# Only the final text is cached, persisted to disk so it survives app restarts
+# ("Clear AI Cache" removes it). Exceptions are never cached, so a miss raises and
+# the answer is stored by calling again with _text once it has been streamed.
+@st.cache_data(persist="disk", max_entries=256, show_spinner=False)
+def stored_completion(messages, model, temperature, max_tokens, _text=None):
+    if _text is None:
+        raise LookupError("no stored completion")
+    return _text
+
+# Streams a fresh answer into a temporary placeholder so text appears as it is
+# generated; the placeholder is cleared once the answer is returned or the stream fails.
+def stream_chat_completion(groq_client, messages, model, temperature, max_tokens):
+    stream = groq_client.chat.completions.create(
+        messages=messages,
+        model=model,
+        temperature=temperature,
+        max_tokens=max_tokens,
+        stream=True
+    )
+    placeholder = st.empty()
     try:
-        prompt = f"""
-        As an HR expert, please analyze this cost comparison data and provide strategic recommendations:
+        with placeholder.container():
+            content = st.write_stream(chunk.choices[0].delta.content or "" for chunk in stream)
+    finally:
+        placeholder.empty()
+    return content
 
+# Streaming runs outside the cached function, so a hit returns plain text instead of
+# replaying every per-token placeholder update recorded during the original run.
+# Answers rejected by is_complete are returned but not stored, so a retry asks again.
+def chat_completion(groq_client, messages, model, temperature, max_tokens, is_complete=bool):
+    try:
+        return stored_completion(messages, model, temperature, max_tokens)
+    except LookupError:
+        pass
+    content = stream_chat_completion(groq_client, messages, model, temperature, max_tokens)
+    if is_complete(content):
+        stored_completion(messages, model, temperature, max_tokens, _text=content)
+    return content
+
+# --- AI INSIGHTS ---
+# Shared byte-for-byte by every HR cost request so providers with prefix caching can reuse it
+HR_SYSTEM_PROMPT = "You are an experienced HR strategy consultant with 15+ years of experience in personnel cost optimization."
+INSIGHTS_SECTION = "### SECTION: INSIGHTS"
+SCENARIOS_SECTION = "### SECTION: SCENARIOS"
+
+# Prompt templates are plain format strings filled with str.format_map. Every HR
+# prompt opens with the same cost context so the request prefix (system prompt +
+# context) is identical across insights, scenarios and combined calls.
+COST_CONTEXT_PROMPT = """
         COST DATA:
-        - New Hire Total Cost: ${calculation_data['total_hire']:,.0f}
-        - Salary Increase Total Cost: ${calculation_data['total_salary_increase']:,.0f}
-        - Annual Salary: ${context_data['hire_salary']:,.0f}
-        - Industry: {context_data.get('industry', 'Unknown')}
-        - Vacancy Duration: {context_data['vacancy_months']} months
-        - Productivity Loss: {context_data['prod_loss_percent']}%
-
-        COST BREAKDOWN:
-        - Recruiting: ${calculation_data['recruiting']['sum']:,.0f}
-        - Vacancy: ${calculation_data['vacancy']['sum']:,.0f}
-        - Onboarding: ${calculation_data['onboarding']['sum']:,.0f}
-        - Productivity Loss: ${calculation_data['productivity']['sum']:,.0f}
-        - Other Costs: ${calculation_data['other']['sum']:,.0f}
-
-        Please analyze and provide:
+        - New Hire Total Cost: ${total_hire:,.0f}
+        - Salary Increase Total Cost: ${total_salary_increase:,.0f}
+        - Annual Salary: ${hire_salary:,.0f}
+        - Industry: {industry}
+        - Vacancy Duration: {vacancy_months} months
+        - Productivity Loss: {prod_loss_percent}%
+
+        TOP 3 COST DRIVERS (New Hire):
+        {top_drivers}
+        """
+
+INSIGHTS_TASK = """
+        As an HR expert, please analyze this cost comparison data and provide strategic recommendations:
         1. Strategic recommendation (New hire vs Salary increase)
-        2. Identify top 3 cost drivers
+        2. Assessment of the top 3 cost drivers
         3. Concrete optimization suggestions
         4. Risk assessment for both options
         5. Long-term perspective (3-5 years)
 
         Respond in English, precisely and business-oriented.
         """
-        chat_completion = groq_client.chat.completions.create(
-            messages=[{
-                "role": "system",
-                "content": "You are an experienced HR strategy consultant with 15+ years of experience in personnel cost optimization."
-            }, {
-                "role": "user", 
-                "content": prompt
-            }],
-            model="llama-3.1-8b-instant",
-            temperature=0.3,
-            max_tokens=1000
-        )
-        return chat_completion.choices[0].message.content
-    except Exception as e:
-        st.error(f"AI Analysis Error: {e}")
-        return None
 
-def get_ai_scenarios(groq_client, calculation_data):
-    if not groq_client:
-        return None
-    try:
-        prompt = f"""
+SCENARIOS_TASK = """
         Create 3 realistic What-If scenarios for this HR cost comparison:
-
-        BASE DATA:
-        - New Hire: ${calculation_data['total_hire']:,.0f}
-        - Salary Increase: ${calculation_data['total_salary_increase']:,.0f}
-
-        Create scenarios for:
         1. Best-Case (optimistic assumptions)
         2. Worst-Case (pessimistic assumptions)  
         3. Economic Downturn (economic crisis)
@@ -414,20 +648,107 @@ def get_ai_scenarios(groq_client, calculation_data):
 
         Format as structured text, not JSON.
         """
-        chat_completion = groq_client.chat.completions.create(
-            messages=[{
-                "role": "user", 
-                "content": prompt
-            }],
-            model="llama-3.1-8b-instant",
-            temperature=0.5,
-            max_tokens=800
-        )
-        return chat_completion.choices[0].message.content
+
+COMBINED_TASK = """
+        Complete both tasks below. Begin your answer to the first task with the line
+        "{insights_section}" and your answer to the second task with the line "{scenarios_section}".
+
+        TASK 1:
+        {insights_task}
+
+        TASK 2:
+        {scenarios_task}
+        """
+
+def build_cost_context(calculation_data, context_data):
+    # Only the three largest cost groups are sent to keep the prompt short
+    drivers = sorted(
+        zip(COST_CATEGORIES, calculation_data['group_sums']),
+        key=lambda item: item[1],
+        reverse=True
+    )[:3]
+    return COST_CONTEXT_PROMPT.format_map({
+        'total_hire': calculation_data['total_hire'],
+        'total_salary_increase': calculation_data['total_salary_increase'],
+        'hire_salary': context_data['hire_salary'],
+        'industry': context_data.get('industry', 'Unknown'),
+        'vacancy_months': context_data['vacancy_months'],
+        'prod_loss_percent': context_data['prod_loss_percent'],
+        'top_drivers': "\n        ".join(f"- {name}: ${amount:,.0f}" for name, amount in drivers),
+    })
+
+def build_insights_prompt(calculation_data, context_data):
+    return build_cost_context(calculation_data, context_data) + INSIGHTS_TASK
+
+def build_scenarios_prompt(calculation_data, context_data):
+    return build_cost_context(calculation_data, context_data) + SCENARIOS_TASK
+
+def build_combined_prompt(calculation_data, context_data):
+    return build_cost_context(calculation_data, context_data) + COMBINED_TASK.format_map({
+        'insights_section': INSIGHTS_SECTION,
+        'scenarios_section': SCENARIOS_SECTION,
+        'insights_task': INSIGHTS_TASK,
+        'scenarios_task': SCENARIOS_TASK,
+    })
+
+# Every HR cost request shares the same system prompt
+def _hr_completion(groq_client, prompt, model, temperature, max_tokens, is_complete=bool):
+    return chat_completion(
+        groq_client,
+        messages=[{
+            "role": "system",
+            "content": HR_SYSTEM_PROMPT
+        }, {
+            "role": "user", 
+            "content": prompt
+        }],
+        model=model,
+        temperature=temperature,
+        max_tokens=max_tokens,
+        is_complete=is_complete
+    )
+
+def get_ai_insights(groq_client, calculation_data, context_data):
+    if not groq_client:
+        return None
+    try:
+        return _hr_completion(groq_client, build_insights_prompt(calculation_data, context_data), AI_MODEL, 0.3, 1000)
+    except Exception as e:
+        st.error(f"AI Analysis Error: {e}")
+        return None
+
+def get_ai_scenarios(groq_client, calculation_data, context_data):
+    if not groq_client:
+        return None
+    try:
+        return _hr_completion(groq_client, build_scenarios_prompt(calculation_data, context_data), AI_FAST_MODEL, 0.5, 800)
     except Exception as e:
         st.error(f"Scenario Generation Error: {e}")
         return None
 
+# A combined reply is only usable if the model kept the scenarios marker and wrote scenarios after it
+def is_combined_reply(content):
+    _, marker, scenarios = content.partition(SCENARIOS_SECTION)
+    return bool(marker and scenarios.strip())
+
+# Strategic analysis and what-if scenarios in one request; returns (insights, scenarios)
+def get_ai_combined(groq_client, calculation_data, context_data):
+    if not groq_client:
+        return None
+    try:
+        content = _hr_completion(
+            groq_client, build_combined_prompt(calculation_data, context_data), AI_MODEL, 0.3, 1800,
+            is_complete=is_combined_reply
+        )
+        if not is_combined_reply(content):
+            st.warning("⚠️ The AI reply could not be split into analysis and scenarios. Please try again.")
+            return None
+        insights, _, scenarios = content.partition(SCENARIOS_SECTION)
+        return insights.replace(INSIGHTS_SECTION, "").strip(), scenarios.strip()
+    except Exception as e:
+        st.error(f"AI Analysis Error: {e}")
+        return None
+
 def get_ai_implementation_insights(groq_client, ai_calculation_data, context_data):
     if not groq_client:
         return None
@@ -453,7 +774,8 @@ def get_ai_implementation_insights(groq_client, ai_calculation_data, context_dat
 
         Respond with actionable business insights.
         """
-        chat_completion = groq_client.chat.completions.create(
+        return chat_completion(
+            groq_client,
             messages=[{
                 "role": "system",
                 "content": "You are an AI implementation specialist with expertise in HR technology adoption and change management."
@@ -461,15 +783,72 @@ def get_ai_implementation_insights(groq_client, ai_calculation_data, context_dat
                 "role": "user", 
                 "content": prompt
             }],
-            model="llama-3.1-8b-instant",
+            model=AI_MODEL,
             temperature=0.3,
             max_tokens=1000
         )
-        return chat_completion.choices[0].message.content
     except Exception as e:
         st.error(f"AI Implementation Analysis Error: {e}")
         return None
 
+# --- FOOTER ---
+FOOTER_HTML = """
+<div style='text-align: center; color: #666; padding: 20px;'>
+    <p>🤖 Powered by <strong>Artificial Intelligence</strong>  💼 HR Intelligence Platform</p>
+    <p><small>All calculations are estimates. Consult an HR expert for final decisions.</small></p>
+</div>
+"""
+
+# --- AI ANALYSIS SECTION ---
+# Runs as a fragment so the AI buttons rerun only this block, not the whole page
+@st.fragment
+def render_ai_analysis(groq_client, results, context_data, use_ai_insights, use_ai_scenarios):
+    use_ai_combined = use_ai_insights and use_ai_scenarios
+    if groq_client and use_ai_combined:
+        if st.button("🚀 Generate AI Analysis + Scenarios", type="primary"):
+            with st.spinner("🤖 AI analyzing your data and creating scenarios..."):
+                combined = get_ai_combined(groq_client, results, context_data)
+                if combined:
+                    insights, scenarios = combined
+                    now = datetime.now()
+                    st.success("✅ AI Analysis and Scenarios complete!")
+                    if insights:
+                        st.session_state.ai_insights = insights
+                        st.session_state.insights_timestamp = now
+                    if scenarios:
+                        st.session_state.ai_scenarios = scenarios
+                        st.session_state.scenarios_timestamp = now
+
+    if groq_client and use_ai_insights:
+        with st.container():
+            st.header("🧠 AI-Powered Strategic Analysis")
+            if not use_ai_combined and st.button("🚀 Generate AI Analysis", type="primary"):
+                with st.spinner("🤖 AI analyzing your data..."):
+                    insights = get_ai_insights(groq_client, results, context_data)
+                    if insights:
+                        st.success("✅ AI Analysis complete!")
+                        st.session_state.ai_insights = insights
+                        st.session_state.insights_timestamp = datetime.now()
+            if 'ai_insights' in st.session_state:
+                st.markdown("### 📋 Latest AI Analysis")
+                st.info(f"Created: {st.session_state.insights_timestamp.strftime('%m/%d/%Y %H:%M')}")
+                st.markdown(st.session_state.ai_insights)
+
+    # Scenarios
+    if groq_client and use_ai_scenarios:
+        st.header("🔮 AI-Generated What-If Scenarios")
+        if not use_ai_combined and st.button("🎲 Generate AI Scenarios"):
+            with st.spinner("🤖 AI creating scenarios..."):
+                scenarios = get_ai_scenarios(groq_client, results, context_data)
+                if scenarios:
+                    st.success("✅ Scenarios generated!")
+                    st.session_state.ai_scenarios = scenarios
+                    st.session_state.scenarios_timestamp = datetime.now()
+        if 'ai_scenarios' in st.session_state:
+            st.markdown("### 📋 Latest AI Scenarios")
+            st.info(f"Created: {st.session_state.scenarios_timestamp.strftime('%m/%d/%Y %H:%M')}")
+            st.markdown(st.session_state.ai_scenarios)
+
 # --- MAIN APP ---
 def main():
     initialize_session_state()
@@ -479,14 +858,14 @@ def main():
     """)
 
     # AI API Key input (if not in secrets)
-    groq_client = init_groq()
+    groq_client = init_groq(resolve_groq_api_key())
     if not groq_client:
         with st.expander("🔑 AI Setup", expanded=True):
             st.info("AI features require an API Key.")
             api_key = st.text_input("AI API Key", type="password", help="API Key for AI features")
             if api_key:
                 st.session_state.groq_api_key = api_key
-                groq_client = init_groq()
+                groq_client = init_groq(api_key)
                 if groq_client:
                     st.success("✅ AI successfully connected!")
                     st.rerun()
@@ -502,12 +881,12 @@ def main():
             with col1:
                 template = st.selectbox("🏭 Industry", [""] + list(INDUSTRY_TEMPLATES.keys()))
                 if template and st.button("Load Template"):
-                    load_template(template)
-                    st.rerun()
+                    if load_template(template):
+                        st.rerun()
             with col2:
                 if st.button("🔄 Reset"):
-                    reset_to_defaults()
-                    st.rerun()
+                    if reset_to_defaults():
+                        st.rerun()
             st.divider()
             st.subheader("Core Parameters")
             st.number_input("Annual Salary (New Hire) $", min_value=20000, max_value=200000, step=1000, key="hire_salary")
@@ -520,156 +899,55 @@ def main():
             st.subheader("🤖 AI Features")
             use_ai_insights = st.checkbox("Enable AI Insights", value=bool(groq_client))
             use_ai_scenarios = st.checkbox("Generate AI Scenarios", value=bool(groq_client))
+            if groq_client and st.button("🧹 Clear AI Cache", help="Discard cached AI responses so the next request queries the model again"):
+                stored_completion.clear()
 
         results = calculate_costs()
+        context_data = session_inputs(CONTEXT_KEYS)
+        vacancy_months = context_data['vacancy_months']
+        total_hire = results['total_hire']
+        total_salary_increase = results['total_salary_increase']
+        difference = abs(total_hire - total_salary_increase)
+        cheaper_total = min(total_hire, total_salary_increase)
+        percentage = (difference / cheaper_total) * 100 if cheaper_total > 0 else 0
 
         col1, col2, col3 = st.columns(3)
         with col1:
-            st.metric("💼 New Hire (Additional Costs)", f"${results['total_hire']:,.0f}",
-                     delta=f"{results['total_hire'] - results['total_salary_increase']:+,.0f}")
+            st.metric("💼 New Hire (Additional Costs)", f"${total_hire:,.0f}",
+                     delta=f"{total_hire - total_salary_increase:+,.0f}")
         with col2:
-            st.metric("💰 Salary Increase (Additional Costs)", f"${results['total_salary_increase']:,.0f}")
+            st.metric("💰 Salary Increase (Additional Costs)", f"${total_salary_increase:,.0f}")
         with col3:
-            difference = abs(results['total_hire'] - results['total_salary_increase'])
-            percentage = (difference / min(results['total_hire'], results['total_salary_increase'])) * 100 if min(results['total_hire'], results['total_salary_increase']) > 0 else 0
             st.metric("💡 Savings", f"${difference:,.0f}", f"{percentage:.1f}%")
 
-        if results['total_hire'] > results['total_salary_increase']:
-            st.success("🎯 Recommendation: Salary increase is cheaper")
-            st.info(f"💰 You save ${difference:,.0f} ({percentage:.1f}%) with a salary increase")
-        else:
-            st.info("🎯 Recommendation: New hire is cheaper")
-            st.success(f"💰 You save ${difference:,.0f} ({percentage:.1f}%) with a new hire")
-
-        # --- AI INSIGHTS ---
-        if groq_client and use_ai_insights:
-            with st.container():
-                st.header("🧠 AI-Powered Strategic Analysis")
-                if st.button("🚀 Generate AI Analysis", type="primary"):
-                    with st.spinner("🤖 AI analyzing your data..."):
-                        context_data = {
-                            'hire_salary': st.session_state.get('hire_salary', 60000),
-                            'vacancy_months': st.session_state.get('vacancy_months', 3),
-                            'prod_loss_percent': st.session_state.get('prod_loss_percent', 40),
-                            'industry': st.session_state.get('industry', 'General')
-                        }
-                        insights = get_ai_insights(groq_client, results, context_data)
-                        if insights:
-                            st.success("✅ AI Analysis complete!")
-                            st.markdown("### 🎯 Strategic Recommendations")
-                            st.markdown(insights)
-                            st.session_state.ai_insights = insights
-                            st.session_state.insights_timestamp = datetime.now()
-                if hasattr(st.session_state, 'ai_insights'):
-                    st.markdown("### 📋 Latest AI Analysis")
-                    st.info(f"Created: {st.session_state.insights_timestamp.strftime('%m/%d/%Y %H:%M')}")
-                    st.markdown(st.session_state.ai_insights)
-
-        # --- AI SCENARIOS ---
-        if groq_client and use_ai_scenarios:
-            st.header("🔮 AI-Generated What-If Scenarios")
-            if st.button("🎲 Generate AI Scenarios"):
-                with st.spinner("🤖 AI creating scenarios..."):
-                    scenarios = get_ai_scenarios(groq_client, results)
-                    if scenarios:
-                        st.success("✅ Scenarios generated!")
-                        st.markdown("### 📈 What-If Scenarios")
-                        st.markdown(scenarios)
-                        st.session_state.ai_scenarios = scenarios
-                        st.session_state.scenarios_timestamp = datetime.now()
-            if hasattr(st.session_state, 'ai_scenarios'):
-                st.markdown("### 📋 Latest AI Scenarios")
-                st.info(f"Created: {st.session_state.scenarios_timestamp.strftime('%m/%d/%Y %H:%M')}")
-                st.markdown(st.session_state.ai_scenarios)
+        hire_wins = total_hire <= total_salary_increase
+        for show, message in RECOMMENDATIONS[hire_wins]:
+            show(message.format(difference=difference, percentage=percentage))
+
+        render_ai_analysis(groq_client, results, context_data, use_ai_insights, use_ai_scenarios)
 
         # --- DETAILED INPUTS ---
         col1, col2 = st.columns([2, 1])
         with col1:
-            st.header("🏢 New Hire - Detailed Costs")
-            with st.expander("🧲 Recruiting Costs", expanded=False):
-                col_a, col_b = st.columns(2)
-                with col_a:
-                    st.number_input("Job Ads (Quantity)", min_value=0, key="job_ads_qty")
-                    st.number_input("Job Ads ($ per ad)", min_value=0, key="job_ads_price")
-                    st.number_input("Recruitment Consultant (%)", min_value=0, max_value=50, key="consultant_percent")
-                with col_b:
-                    st.number_input("Interview Hours", min_value=0, key="interview_hours")
-                    st.number_input("Interview Hourly Rate ($)", min_value=0, key="interview_rate")
-                    st.number_input("Assessment Center ($)", min_value=0, key="assessment_price")
-            with st.expander("⏳ Vacancy Costs", expanded=False):
-                col_a, col_b = st.columns(2)
-                with col_a:
-                    st.number_input("Lost Productivity ($/Month)", min_value=0, key="productivity_price")
-                    st.number_input("Overtime Hours", min_value=0, key="overtime_qty")
-                    st.number_input("Overtime Rate ($/Hour)", min_value=0, key="overtime_price")
-                with col_b:
-                    st.number_input("External Support (Days)", min_value=0, key="external_qty")
-                    st.number_input("External Support ($/Day)", min_value=0, key="external_price")
-                    st.number_input("Monthly Salary ($)", min_value=0, key="salary_price")
-            with st.expander("🎓 Onboarding Costs", expanded=False):
-                col_a, col_b = st.columns(2)
-                with col_a:
-                    st.number_input("HR Effort (Hours)", min_value=0, key="hr_hours")
-                    st.number_input("HR Hourly Rate ($)", min_value=0, key="hr_rate")
-                    st.number_input("Colleague Training (Hours)", min_value=0, key="colleague_hours")
-                    st.number_input("Colleague Hourly Rate ($)", min_value=0, key="colleague_rate")
-                with col_b:
-                    st.number_input("Training/Courses ($)", min_value=0, key="training_cost")
-                    st.number_input("IT Setup & Equipment ($)", min_value=0, key="it_cost")
-                    st.number_input("Mentor Hours", min_value=0, key="mentor_hours")
-                    st.number_input("Mentor Hourly Rate ($)", min_value=0, key="mentor_rate")
-            with st.expander("⚠️ Other Costs", expanded=False):
-                col_a, col_b = st.columns(2)
-                with col_a:
-                    st.number_input("Error Rate ($)", min_value=0, key="error_cost")
-                    st.number_input("Knowledge Loss ($)", min_value=0, key="knowhow_cost")
-                with col_b:
-                    st.number_input("Customer Retention/Revenue Loss ($)", min_value=0, key="customer_cost")
-                    st.number_input("Team Morale ($)", min_value=0, key="team_cost")
-            st.header("💰 Alternative: Salary Increase")
-            with st.expander("💶 Salary Increase Details", expanded=True):
-                col_a, col_b = st.columns(2)
-                with col_a:
-                    st.number_input("Increase (%)", min_value=0, max_value=50, key="increase_percent")
-                with col_b:
-                    st.number_input("Social Security on Increase (%)", min_value=0, key="social_increase_percent")
-                    st.number_input("Benefits on Increase (%)", min_value=0, key="benefits_increase_percent")
+            # Edits are batched in a form so typing doesn't rerun the whole page per field
+            with st.form("detailed_cost_inputs"):
+                st.header("🏢 New Hire - Detailed Costs")
+                for title, left, right in NEW_HIRE_INPUTS:
+                    render_input_group(title, left, right)
+                st.header("💰 Alternative: Salary Increase")
+                for title, left, right in SALARY_INCREASE_INPUTS:
+                    render_input_group(title, left, right, expanded=True)
+                st.form_submit_button("🔄 Update Calculation", type="primary")
 
         with col2:
             st.subheader("📊 Cost Distribution")
-            categories = ["Recruiting", "Vacancy", "Onboarding", "Productivity", "Other", "Salary Difference"]
-            values = [
-                results['recruiting']['sum'],
-                results['vacancy']['sum'],
-                results['onboarding']['sum'],
-                results['productivity']['sum'],
-                results['other']['sum'],
-                results['fixed']['sum']
-            ]
-            fig = px.pie(
-                values=values,
-                names=categories,
-                title="New Hire - Cost Distribution",
-                color_discrete_sequence=px.colors.qualitative.Set3
-            )
-            fig.update_traces(textposition='inside', textinfo='percent+label')
-            fig.update_layout(height=400)
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(build_cost_pie(results['group_sums']), use_container_width=True, config=STATIC_CHART_CONFIG)
             st.subheader("⚖️ Direct Comparison")
-            comparison_data = {
-                "Option": ["New Hire", "Salary Increase"],
-                "Cost": [results['total_hire'], results['total_salary_increase']]
-            }
-            fig2 = px.bar(
-                comparison_data,
-                x="Option",
-                y="Cost",
-                title="Cost Comparison",
-                color="Cost",
-                color_continuous_scale="RdYlGn_r"
+            comparison_data = pd.DataFrame(
+                {"Cost": [total_hire, total_salary_increase]},
+                index=["New Hire", "Salary Increase"]
             )
-            fig2.update_layout(showlegend=False, height=300)
-            st.plotly_chart(fig2, use_container_width=True)
+            st.bar_chart(comparison_data, y="Cost", height=300)
 
     with tab2:
         st.header("🤖 AI Agent Implementation Analysis")
@@ -685,8 +963,8 @@ def main():
             # AI Agent Template Selection
             ai_template = st.selectbox("🤖 AI Agent Type", [""] + list(AI_AGENT_TEMPLATES.keys()), key="ai_template_select")
             if ai_template and st.button("Load AI Template"):
-                load_ai_template(ai_template)
-                st.rerun()
+                if load_ai_template(ai_template):
+                    st.rerun()
             
             st.markdown("---")
             
@@ -740,24 +1018,10 @@ def main():
             # Visual representation
             st.subheader("📊 Cost vs Savings Breakdown")
             
-            # Monthly comparison chart
-            months = list(range(1, 37))  # 3 years
-            cumulative_costs = [ai_results['setup_cost'] + (ai_results['monthly_cost'] * month) for month in months]
-            cumulative_savings = [ai_results['monthly_savings'] * month for month in months]
-            cumulative_net = [savings - cost for savings, cost in zip(cumulative_savings, cumulative_costs)]
-            
-            chart_data = pd.DataFrame({
-                'Month': months,
-                'Cumulative Costs': cumulative_costs,
-                'Cumulative Savings': cumulative_savings,
-                'Net Benefit': cumulative_net
-            })
-            
-            fig = px.line(chart_data, x='Month', y=['Cumulative Costs', 'Cumulative Savings', 'Net Benefit'],
-                         title="AI Implementation: Costs vs Savings Over Time",
-                         labels={'value': 'Amount ($)', 'variable': 'Category'})
-            fig.add_hline(y=0, line_dash="dash", line_color="red", annotation_text="Break-even")
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(
+                build_ai_roi_chart(ai_results['setup_cost'], ai_results['monthly_cost'], ai_results['monthly_savings']),
+                use_container_width=True
+            )
 
         # AI Implementation Insights
         if groq_client:
@@ -772,12 +1036,10 @@ def main():
                     ai_insights = get_ai_implementation_insights(groq_client, ai_results, context_data)
                     if ai_insights:
                         st.success("✅ AI Implementation Analysis complete!")
-                        st.markdown("### 🎯 Implementation Strategy")
-                        st.markdown(ai_insights)
                         st.session_state.ai_implementation_insights = ai_insights
                         st.session_state.ai_insights_timestamp = datetime.now()
             
-            if hasattr(st.session_state, 'ai_implementation_insights'):
+            if 'ai_implementation_insights' in st.session_state:
                 st.markdown("### 📋 Latest AI Implementation Analysis")
                 st.info(f"Created: {st.session_state.ai_insights_timestamp.strftime('%m/%d/%Y %H:%M')}")
                 st.markdown(st.session_state.ai_implementation_insights)
@@ -789,22 +1051,20 @@ def main():
         This analysis helps you make the most strategic decision for your organization.
         """)
         
-        # Calculate all costs
-        hr_results = calculate_costs()
-        ai_results = calculate_ai_costs()
+        # Totals are reused from the first two tabs rather than recalculated
         
         # Combined comparison
         col1, col2, col3 = st.columns(3)
         
         with col1:
             st.subheader("💼 New Hire")
-            st.metric("Total Cost", f"${hr_results['total_hire']:,.0f}")
-            st.metric("Time to Value", f"{st.session_state.get('vacancy_months', 3)} months")
+            st.metric("Total Cost", f"${total_hire:,.0f}")
+            st.metric("Time to Value", f"{vacancy_months} months")
             st.metric("Risk Level", "Medium-High")
             
         with col2:
             st.subheader("💰 Salary Increase")
-            st.metric("Total Cost", f"${hr_results['total_salary_increase']:,.0f}")
+            st.metric("Total Cost", f"${total_salary_increase:,.0f}")
             st.metric("Time to Value", "Immediate")
             st.metric("Risk Level", "Low")
             
@@ -820,43 +1080,22 @@ def main():
         # Strategic recommendation
         st.header("🎯 Strategic Recommendation Matrix")
         
-        # Create comparison dataframe
-        comparison_data = {
-            'Option': ['New Hire', 'Salary Increase', 'AI Agent (3yr benefit)'],
-            'Cost/Benefit': [
-                -hr_results['total_hire'],  # Cost (negative)
-                -hr_results['total_salary_increase'],  # Cost (negative) 
-                ai_results['net_benefit']  # Benefit (positive)
-            ],
-            'Implementation Time': [
-                st.session_state.get('vacancy_months', 3),
-                0,
-                ai_results['implementation_months']
-            ]
-        }
-        
-        df = pd.DataFrame(comparison_data)
+        # Comparison values, one per entry in STRATEGY_OPTIONS
+        cost_benefit = (
+            -total_hire,  # Cost (negative)
+            -total_salary_increase,  # Cost (negative) 
+            ai_results['net_benefit']  # Benefit (positive)
+        )
+        implementation_time = (vacancy_months, 0, ai_results['implementation_months'])
         
         # Visualization
-        fig = px.scatter(df, x='Implementation Time', y='Cost/Benefit', 
-                        text='Option', size=[abs(x) for x in df['Cost/Benefit']], 
-                        color='Cost/Benefit',
-                        title="Strategic Options Comparison",
-                        labels={
-                            'Implementation Time': 'Time to Implement (Months)',
-                            'Cost/Benefit': 'Net Financial Impact ($)'
-                        },
-                        color_continuous_scale="RdYlGn")
-        fig.add_hline(y=0, line_dash="dash", line_color="gray", annotation_text="Break-even Line")
-        fig.update_traces(textposition="top center")
-        fig.update_layout(height=500)
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(build_strategy_scatter(cost_benefit, implementation_time), use_container_width=True)
         
         # Decision framework
         st.subheader("🧭 Decision Framework")
         
-        best_financial = df.loc[df['Cost/Benefit'].idxmax(), 'Option']
-        fastest_implement = df.loc[df['Implementation Time'].idxmin(), 'Option']
+        best_financial = STRATEGY_OPTIONS[cost_benefit.index(max(cost_benefit))]
+        fastest_implement = STRATEGY_OPTIONS[implementation_time.index(min(implementation_time))]
         
         st.success(f"**Best Financial Outcome:** {best_financial}")
         st.info(f"**Fastest Implementation:** {fastest_implement}")
@@ -868,20 +1107,14 @@ def main():
             "🚨 **Urgent Need (< 1 month)**": "Consider **Salary Increase** for immediate results, then plan AI implementation for long-term efficiency.",
             "⚖️ **Balanced Approach (1-6 months)**": "Evaluate between **New Hire** and **AI Agent** based on your strategic priorities and risk tolerance.",
             "🔮 **Long-term Strategy (> 6 months)**": "**AI Agent** likely provides best ROI if implementation is successful. Consider hybrid approach.",
-            "💰 **Budget Constrained**": f"**{df.loc[df['Cost/Benefit'].idxmax(), 'Option']}** offers the best financial outcome.",
+            "💰 **Budget Constrained**": f"**{best_financial}** offers the best financial outcome.",
             "🎯 **Growth Phase**": "**New Hire** for immediate capacity, **AI Agent** for scalable long-term growth."
         }
         
-        for scenario, recommendation in scenarios.items():
-            st.markdown(f"**{scenario}**: {recommendation}")
+        st.markdown("\n\n".join(f"**{scenario}**: {recommendation}" for scenario, recommendation in scenarios.items()))
 
     st.markdown("---")
-    st.markdown("""
-    <div style='text-align: center; color: #666; padding: 20px;'>
-        <p>🤖 Powered by <strong>Artificial Intelligence</strong>  💼 HR Intelligence Platform</p>
-        <p><small>All calculations are estimates. Consult an HR expert for final decisions.</small></p>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(FOOTER_HTML, unsafe_allow_html=True)
 
 if __name__ == "__main__":
     main()